@@ -13,44 +13,98 @@ This avoids AI usage/credits: it uses only local browser automation + messaging.
 from __future__ import annotations
 
 import argparse
+import functools
+import heapq
 import json
 import os
+import queue
 import random
 import re
 import sqlite3
 import subprocess
 import sys
+import threading
 import time
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 
+try:
+    # Optional: C JSON parser, 2-5x faster on the browser-eval payloads.
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
 DEFAULT_DB = "/home/tnu/clawd/data/amazon_price_history.sqlite3"
 DEFAULT_CHANNEL = "telegram"
 DEFAULT_TARGET = "476265210"  # Tim
 
 
 PRICE_RE = re.compile(r"([0-9]+(?:\.[0-9]{2})?)")
+# Bound method: skips the attribute lookup on every call of a hot parser.
+_PRICE_SEARCH = PRICE_RE.search
+_STRIP_COMMAS = {ord(","): None}
 
 
-def run_cmd(args: list[str], *, timeout: int = 120) -> str:
-    p = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=timeout)
+def run_cmd(args: list[str], *, timeout: int = 120) -> bytes:
+    # Binary pipes: stdout is JSON we parse as bytes, so skip the locale
+    # decode that text=True would do on the whole payload. A sized pipe
+    # buffer keeps large evaluate results to a few reads.
+    p = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=1 << 16)
+    try:
+        out, err = p.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        p.kill()
+        p.communicate()
+        raise
     if p.returncode != 0:
-        raise RuntimeError(f"Command failed ({p.returncode}): {' '.join(args)}\n{p.stderr.strip()}")
-    return p.stdout
+        raise RuntimeError(
+            f"Command failed ({p.returncode}): {' '.join(args)}\n{err.decode('utf-8', 'replace').strip()}"
+        )
+    return out
 
 
 def rand_sleep(min_s: float, max_s: float):
     time.sleep(random.uniform(min_s, max_s))
 
 
+@functools.lru_cache(maxsize=2048)
 def parse_price_gbp(s: str | None) -> float | None:
+    # Memoised: the same "£79.99"-class token recurs across buybox, AOD
+    # offers and repeated watchlist entries, so repeats skip the scan.
     if not s:
         return None
-    s = s.strip().replace(",", "")
-    m = PRICE_RE.search(s)
+    # Single forward scan for the dominant "£1,234.56" shapes — no regex
+    # engine entry and no comma-stripped copy of the whole string. Mirrors
+    # the regex semantics: first digit run, thousands commas ignored,
+    # decimals only taken as an exact two-digit pair.
+    n = len(s)
+    i = 0
+    while i < n and not "0" <= s[i] <= "9":
+        i += 1
+    if i < n:
+        digits: list[str] = []
+        while i < n and ("0" <= s[i] <= "9" or s[i] == ","):
+            if s[i] != ",":
+                digits.append(s[i])
+            i += 1
+        if i < n and s[i] == ".":
+            frac = s[i + 1 : i + 3]
+            if len(frac) == 2 and frac.isdigit():
+                digits.append("." + frac)
+        try:
+            return float("".join(digits))
+        except ValueError:
+            pass
+    # Fallback for anything the scan couldn't settle.
+    m = _PRICE_SEARCH(s.translate(_STRIP_COMMAS))
     if not m:
         return None
     try:
@@ -75,7 +129,30 @@ def _ensure_column(conn: sqlite3.Connection, table: str, col: str, decl: str):
 
 def init_db(db_path: str) -> sqlite3.Connection:
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    # check_same_thread=False: inserts run on the background writer thread;
+    # main-thread reads only happen after that thread is joined.
+    # cached_statements keeps every statement this script runs (inserts,
+    # migrations, history scans) compiled for the life of the connection.
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+    # Writer batches begin with BEGIN IMMEDIATE: take the write lock up
+    # front rather than upgrading mid-transaction.
+    conn.isolation_level = "IMMEDIATE"
+
+    # Page size only takes effect on a fresh DB and must precede WAL.
+    conn.execute("PRAGMA page_size=8192")
+
+    # WAL + relaxed sync: one run writes dozens of rows, so avoid a full
+    # fsync per statement. NORMAL is still durable enough for price history.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # 64 MB page cache keeps the GROUP BY day scans in memory as history grows.
+    conn.execute("PRAGMA cache_size=-65536")
+    # Memory-mapped reads for the history scans (256 MB window).
+    conn.execute("PRAGMA mmap_size=268435456")
+    # Don't fail instantly if another run/reader holds the lock.
+    conn.execute("PRAGMA busy_timeout=5000")
+
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS products (
@@ -105,31 +182,102 @@ def init_db(db_path: str) -> sqlite3.Connection:
         """
     )
 
+    # Cold storage for rows past the retention window. Same base schema
+    # and same migrations as price_checks so INSERT ... SELECT * lines up.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS price_checks_archive (
+          id INTEGER PRIMARY KEY,
+          run_id TEXT,
+          ts INTEGER,
+          day TEXT,
+          asin TEXT,
+          label TEXT,
+          title TEXT,
+          url TEXT,
+          price_raw TEXT,
+          price_gbp REAL,
+          ok INTEGER,
+          error TEXT
+        );
+        """
+    )
+
     # Lightweight migrations / extra fields
-    _ensure_column(conn, "price_checks", "buybox_price_raw", "TEXT")
-    _ensure_column(conn, "price_checks", "buybox_price_gbp", "REAL")
-    _ensure_column(conn, "price_checks", "lowest_new_price_raw", "TEXT")
-    _ensure_column(conn, "price_checks", "lowest_new_price_gbp", "REAL")
-    _ensure_column(conn, "price_checks", "price_source", "TEXT")
+    for table in ("price_checks", "price_checks_archive"):
+        _ensure_column(conn, table, "buybox_price_raw", "TEXT")
+        _ensure_column(conn, table, "buybox_price_gbp", "REAL")
+        _ensure_column(conn, table, "lowest_new_price_raw", "TEXT")
+        _ensure_column(conn, table, "lowest_new_price_gbp", "REAL")
+        _ensure_column(conn, table, "price_source", "TEXT")
 
     conn.execute("CREATE INDEX IF NOT EXISTS idx_checks_day_asin ON price_checks(day, asin);")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_checks_run ON price_checks(run_id);")
+    # Covers the daily-min history scans: index-only, no heap reads. v2
+    # matches the query predicate exactly (partial on both filters, day
+    # descending to match the ORDER BY); the old variant is dropped.
+    conn.execute("DROP INDEX IF EXISTS idx_checks_asin_day_price;")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_checks_asin_day_price_v2"
+        " ON price_checks(asin, day DESC, price_gbp)"
+        " WHERE ok = 1 AND price_gbp IS NOT NULL;"
+    )
     conn.commit()
     return conn
 
 
-def upsert_product(conn: sqlite3.Connection, asin: str, label: str):
-    conn.execute(
-        "INSERT INTO products(asin,label,created_ts) VALUES(?,?,?) ON CONFLICT(asin) DO UPDATE SET label=excluded.label",
-        (asin, label, now_ts()),
-    )
+# Prepared once; rows are collected per run and written via executemany so
+# SQLite parses/plans each statement a single time.
+UPSERT_PRODUCT_SQL = (
+    "INSERT INTO products(asin,label,created_ts) VALUES(?,?,?) ON CONFLICT(asin) DO UPDATE SET label=excluded.label"
+)
+
+INSERT_CHECK_SQL = """
+INSERT INTO price_checks(
+  run_id,ts,day,asin,label,title,url,
+  price_raw,price_gbp,
+  buybox_price_raw,buybox_price_gbp,
+  lowest_new_price_raw,lowest_new_price_gbp,
+  price_source,
+  ok,error
+)
+VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
+
+def writer_loop(conn: sqlite3.Connection, q: queue.Queue):
+    """Drain check rows from the queue and batch them into the DB.
 
+    Runs on its own thread so scrape workers never block on an fsync.
+    Flushes every 50 rows or once a second; a None sentinel ends the loop.
+    """
+    pending: list[tuple] = []
 
-def store_check(
-    conn: sqlite3.Connection,
+    def flush():
+        if pending:
+            with conn:
+                conn.executemany(INSERT_CHECK_SQL, pending)
+            pending.clear()
+
+    while True:
+        try:
+            row = q.get(timeout=1.0)
+        except queue.Empty:
+            flush()
+            continue
+        if row is None:
+            break
+        pending.append(row)
+        if len(pending) >= 50:
+            flush()
+    flush()
+
+
+def check_row(
     *,
     run_id: str,
     ts: int,
+    day: str,
     asin: str,
     label: str,
     title: str | None,
@@ -143,37 +291,24 @@ def store_check(
     price_source: str | None,
     ok: bool,
     error: str | None,
-):
-    conn.execute(
-        """
-        INSERT INTO price_checks(
-          run_id,ts,day,asin,label,title,url,
-          price_raw,price_gbp,
-          buybox_price_raw,buybox_price_gbp,
-          lowest_new_price_raw,lowest_new_price_gbp,
-          price_source,
-          ok,error
-        )
-        VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            run_id,
-            ts,
-            local_day(ts),
-            asin,
-            label,
-            title,
-            url,
-            price_raw,
-            price_gbp,
-            buybox_price_raw,
-            buybox_price_gbp,
-            lowest_new_price_raw,
-            lowest_new_price_gbp,
-            price_source,
-            1 if ok else 0,
-            error,
-        ),
+) -> tuple:
+    return (
+        run_id,
+        ts,
+        day,
+        asin,
+        label,
+        title,
+        url,
+        price_raw,
+        price_gbp,
+        buybox_price_raw,
+        buybox_price_gbp,
+        lowest_new_price_raw,
+        lowest_new_price_gbp,
+        price_source,
+        1 if ok else 0,
+        error,
     )
 
 
@@ -183,10 +318,10 @@ def openclaw_browser_start():
 
 def openclaw_browser_open(url: str) -> str:
     out = run_cmd(["openclaw", "browser", "open", "--json", "--expect-final", "--timeout", "60000", url], timeout=90)
-    obj = json.loads(out)
+    obj = _json_loads(out)
     tid = obj.get("targetId")
     if not tid:
-        raise RuntimeError(f"No targetId from open: {out[:200]}")
+        raise RuntimeError(f"No targetId from open: {out[:200].decode('utf-8', 'replace')}")
     return tid
 
 
@@ -202,30 +337,7 @@ def openclaw_browser_close(target_id: str):
         pass
 
 
-def openclaw_browser_eval_product(target_id: str) -> dict[str, Any]:
-    # Extract title + buy-box price + best-effort offers link (best-effort)
-    fn = r'''() => {
-      const buyboxPrice = document.querySelector("#corePriceDisplay_desktop_feature_div .a-price .a-offscreen")?.innerText
-        || document.querySelector("#corePriceDisplay_desktop_feature_div .a-offscreen")?.innerText
-        || document.querySelector(".a-price .a-offscreen")?.innerText
-        || null;
-
-      // Link to offers / buying options (varies a lot). Try a few patterns.
-      const offersHref = (
-        document.querySelector('#buybox-see-all-buying-choices a')?.href
-        || document.querySelector("a[href*='/gp/offer-listing/']")?.href
-        || document.querySelector("a[href*='offer-listing']")?.href
-        || null
-      );
-
-      return {
-        title: (document.getElementById("productTitle")?.innerText||"").trim(),
-        buyboxPrice,
-        offersUrl: offersHref,
-        url: location.href
-      };
-    }'''
-
+def openclaw_browser_evaluate(target_id: str, fn: str) -> dict[str, Any]:
     out = run_cmd(
         [
             "openclaw",
@@ -242,78 +354,245 @@ def openclaw_browser_eval_product(target_id: str) -> dict[str, Any]:
         ],
         timeout=90,
     )
-    obj = json.loads(out)
+    obj = _json_loads(out)
     return obj.get("result") or {}
 
 
-def openclaw_browser_eval_lowest_new_offer(target_id: str) -> dict[str, Any]:
-    # On the All Offers Display (AOD) view, pick the lowest "New" offer currently loaded.
-    fn = r'''() => {
-      const offers = [...document.querySelectorAll('#aod-offer-list #aod-offer')];
+class BrowserSession:
+    """One long-lived `openclaw browser repl --json` process.
+
+    The CLI helpers above fork a fresh openclaw (Node startup + browser
+    reconnect) for every open/navigate/evaluate/close — 5+ spawns per ASIN.
+    The repl keeps a single subprocess and speaks newline-delimited JSON
+    over its pipes. If the repl subcommand is unavailable (older openclaw)
+    or the pipe breaks mid-run, we fall back to the one-shot CLI calls.
+    """
+
+    def __init__(self):
+        self._proc: subprocess.Popen | None = None
+        self._next_id = 0
+
+    def start(self):
+        try:
+            self._proc = subprocess.Popen(
+                ["openclaw", "browser", "repl", "--json"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self._proc = None
+
+    def stop(self):
+        proc, self._proc = self._proc, None
+        if not proc:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=10)
+        except Exception:
+            proc.kill()
+
+    def _rpc(self, method: str, params: dict[str, Any]) -> dict[str, Any] | None:
+        """Send one command over the repl pipe; None means 'use CLI fallback'."""
+        proc = self._proc
+        if proc is None:
+            return None
+        self._next_id += 1
+        req_id = self._next_id
+        try:
+            proc.stdin.write((json.dumps({"id": req_id, "method": method, "params": params}) + "\n").encode())
+            proc.stdin.flush()
+            while True:
+                line = proc.stdout.readline()
+                if not line:
+                    raise OSError("repl pipe closed")
+                obj = _json_loads(line)
+                if obj.get("id") != req_id:
+                    continue  # unsolicited event
+                if obj.get("error"):
+                    raise RuntimeError(f"repl {method} failed: {obj['error']}")
+                return obj.get("result") or {}
+        except (OSError, ValueError):
+            # Pipe broke or garbage on the wire: demote to CLI for the rest of the run.
+            self.stop()
+            return None
+
+    def open(self, url: str) -> str:
+        res = self._rpc("open", {"url": url, "expectFinal": True, "timeoutMs": 60000})
+        if res is None:
+            return openclaw_browser_open(url)
+        tid = res.get("targetId")
+        if not tid:
+            raise RuntimeError(f"No targetId from repl open: {res}")
+        return tid
+
+    def navigate(self, target_id: str, url: str):
+        if self._rpc("navigate", {"targetId": target_id, "url": url}) is None:
+            openclaw_browser_navigate(target_id, url)
+
+    def evaluate(self, target_id: str, fn: str) -> dict[str, Any]:
+        res = self._rpc("evaluate", {"targetId": target_id, "fn": fn, "timeoutMs": 60000})
+        if res is None:
+            return openclaw_browser_evaluate(target_id, fn)
+        return res.get("result") or res
+
+    def close(self, target_id: str):
+        if self._rpc("close", {"targetId": target_id}) is None:
+            openclaw_browser_close(target_id)
+
+
+# One BrowserSession and one reused tab per worker thread. The scrape is
+# I/O-bound on subprocess pipes, so threads overlap cleanly under the GIL.
+# Reusing a tab across ASINs avoids Chromium's per-target setup cost.
+_worker_local = threading.local()
+_all_workers: list[tuple[BrowserSession, str | None]] = []
+_all_workers_lock = threading.Lock()
+
+
+_READY_JS = "() => ({ready: document.readyState === 'complete'})"
+
+
+def wait_page_ready(session: BrowserSession, target_id: str, timeout_s: float = 30.0):
+    """Poll document.readyState until the page finishes loading.
+
+    Deterministic readiness instead of guessing with multi-second sleeps;
+    falls through quietly on timeout so a stuck page degrades to the old
+    best-effort behaviour.
+    """
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            if (session.evaluate(target_id, _READY_JS) or {}).get("ready"):
+                return
+        except Exception:
+            pass
+        time.sleep(0.25)
+
+
+def worker_session() -> BrowserSession:
+    session = getattr(_worker_local, "session", None)
+    if session is None:
+        session = BrowserSession()
+        session.start()
+        _worker_local.session = session
+        _worker_local.tab = None
+        with _all_workers_lock:
+            _all_workers.append((session, None))
+    return session
+
+
+def worker_tab(session: BrowserSession) -> str:
+    tab = getattr(_worker_local, "tab", None)
+    if tab is None:
+        tab = session.open("about:blank")
+        _worker_local.tab = tab
+        with _all_workers_lock:
+            for i, (s, _) in enumerate(_all_workers):
+                if s is session:
+                    _all_workers[i] = (session, tab)
+                    break
+    return tab
+
+
+def shutdown_workers():
+    with _all_workers_lock:
+        workers = list(_all_workers)
+        _all_workers.clear()
+    for session, tab in workers:
+        if tab:
+            try:
+                session.close(tab)
+            except Exception:
+                pass
+        session.stop()
+
+
+# Constant eval payloads, hoisted like _READY_JS: built once at import,
+# never re-assembled per call.
+# Extract title + buy-box price + best-effort offers link (best-effort)
+_PRODUCT_JS = r'''() => {
+      // Query the core price block once and drill into it; textContent
+      // avoids the forced layout that innerText triggers per read.
+      const core = document.querySelector("#corePriceDisplay_desktop_feature_div");
+      const priceEl = (core && (core.querySelector(".a-price .a-offscreen") || core.querySelector(".a-offscreen")))
+        || document.querySelector(".a-price .a-offscreen");
+      const buyboxPrice = priceEl ? priceEl.textContent : null;
+
+      // Link to offers / buying options (varies a lot). Try a few patterns.
+      const offersHref = (
+        document.querySelector('#buybox-see-all-buying-choices a')?.href
+        || document.querySelector("a[href*='/gp/offer-listing/']")?.href
+        || document.querySelector("a[href*='offer-listing']")?.href
+        || null
+      );
+
+      return {
+        title: (document.getElementById("productTitle")?.textContent||"").trim(),
+        buyboxPrice,
+        offersUrl: offersHref,
+        url: location.href
+      };
+    }'''
+
+# On the All Offers Display (AOD) view, pick the lowest "New" offer.
+# AOD lazy-loads, so the scroll-and-sample loop runs entirely in the
+# page (one evaluate round trip) instead of alternating scroll/eval
+# calls from Python.
+_AOD_LOWEST_NEW_JS = r'''async () => {
+      // Regexes hoisted once; the scan body never recompiles them.
+      const PRICE_NUM_RE = /([0-9]+(?:\.[0-9]{2})?)/;
+      const COMMA_RE = /,/g;
       function priceToNum(s){
         if(!s) return null;
-        const m = (s.replace(/,/g,'').match(/([0-9]+(?:\.[0-9]{2})?)/));
+        const m = PRICE_NUM_RE.exec(s.replace(COMMA_RE, ''));
         return m ? parseFloat(m[1]) : null;
       }
-      let best = null;
-      let bestNum = null;
+      // Read the condition off the offer heading when present (cheap,
+      // constant-size string) instead of materializing the whole offer text.
+      function conditionOf(offer){
+        const el = offer.querySelector('[id^="aod-offer-heading"], .a-text-bold');
+        const t = ((el ? el.textContent : offer.textContent) || '').trim();
+        return (t.split('\n')[0] || '').trim().toLowerCase();
+      }
+      // Single pass per sample: running min over a numeric accumulator,
+      // element ref kept so the winning text is resolved once at the end.
+      // textContent throughout — innerText forces a reflow per offer.
+      let bestEl = null;
+      let bestNum = Infinity;
       let newCount = 0;
-      for(const offer of offers){
-        const txt = (offer.innerText||'').trim();
-        const first = (txt.split(/\n/)[0]||'').trim();
-        if(!/^New$/i.test(first)) continue;
-        newCount++;
-        const priceText = offer.querySelector('span[id^="aod-price-"]')?.innerText || null;
-        const n = priceToNum(priceText);
-        if(n == null) continue;
-        if(bestNum == null || n < bestNum){
-          bestNum = n;
-          best = priceText;
+      let loaded = 0;
+      for(let i = 0; i < 4; i++){
+        const offers = document.querySelectorAll('#aod-offer-list #aod-offer');
+        loaded = offers.length;
+        newCount = 0;
+        for(let j = 0; j < offers.length; j++){
+          const offer = offers[j];
+          if(conditionOf(offer) !== 'new') continue;
+          newCount++;
+          const priceEl = offer.querySelector('span[id^="aod-price-"]');
+          const n = priceToNum(priceEl ? priceEl.textContent : null);
+          if(n == null) continue;
+          if(n < bestNum){
+            bestNum = n;
+            bestEl = priceEl;
+          }
         }
+        const atEnd = (window.innerHeight + window.scrollY) >= (document.body.scrollHeight - 5);
+        if(atEnd) break;
+        window.scrollBy(0, 1800);
+        await new Promise(r => setTimeout(r, 800));
       }
-      return {loadedOfferCount: offers.length, newOfferCount: newCount, lowestNewPrice: best};
+      return {loadedOfferCount: loaded, newOfferCount: newCount, lowestNewPrice: bestEl ? bestEl.textContent : null};
     }'''
 
-    out = run_cmd(
-        [
-            "openclaw",
-            "browser",
-            "evaluate",
-            "--json",
-            "--expect-final",
-            "--timeout",
-            "60000",
-            "--target-id",
-            target_id,
-            "--fn",
-            fn,
-        ],
-        timeout=90,
-    )
-    obj = json.loads(out)
-    return obj.get("result") or {}
 
+def openclaw_browser_eval_product(session: BrowserSession, target_id: str) -> dict[str, Any]:
+    return session.evaluate(target_id, _PRODUCT_JS)
 
-def openclaw_browser_scroll_more(target_id: str, px: int = 1800) -> dict[str, Any]:
-    fn = f"() => {{ const before = window.scrollY; window.scrollBy(0, {px}); const after = window.scrollY; const atEnd = (window.innerHeight + window.scrollY) >= (document.body.scrollHeight - 5); return {{before, after, atEnd, scrollHeight: document.body.scrollHeight}}; }}"
-    out = run_cmd(
-        [
-            "openclaw",
-            "browser",
-            "evaluate",
-            "--json",
-            "--expect-final",
-            "--timeout",
-            "60000",
-            "--target-id",
-            target_id,
-            "--fn",
-            fn,
-        ],
-        timeout=90,
-    )
-    obj = json.loads(out)
-    return obj.get("result") or {}
+
+def openclaw_browser_eval_lowest_new_offer(session: BrowserSession, target_id: str) -> dict[str, Any]:
+    return session.evaluate(target_id, _AOD_LOWEST_NEW_JS)
 
 
 def send_message(channel: str, target: str, message: str):
@@ -341,19 +620,29 @@ def load_watchlist(path: str) -> tuple[str, list[WatchItem]]:
     return name, items
 
 
-def daily_min_prices(conn: sqlite3.Connection, asin: str, limit_days: int = 7) -> list[tuple[str, float]]:
-    rows = conn.execute(
-        """
-        SELECT day, MIN(price_gbp) AS p
+def recent_daily_mins(
+    conn: sqlite3.Connection, asins: list[str], limit_days: int = 7
+) -> dict[str, list[tuple[str, float]]]:
+    """Daily min price per ASIN over the last limit_days, one query for all."""
+    if not asins:
+        return {}
+    placeholders = ",".join("?" * len(asins))
+    cur = conn.execute(
+        f"""
+        SELECT asin, day, MIN(price_gbp) AS p
         FROM price_checks
-        WHERE asin = ? AND ok = 1 AND price_gbp IS NOT NULL
-        GROUP BY day
-        ORDER BY day DESC
-        LIMIT ?
+        WHERE asin IN ({placeholders}) AND ok = 1 AND price_gbp IS NOT NULL
+          AND day >= date('now', ?, 'localtime')
+        GROUP BY asin, day
+        ORDER BY asin, day DESC
         """,
-        (asin, limit_days),
-    ).fetchall()
-    return [(r[0], float(r[1])) for r in rows]
+        (*asins, f"-{limit_days} days"),
+    )
+    # Stream the cursor straight into the buckets; no fetchall() snapshot.
+    hist: dict[str, list[tuple[str, float]]] = defaultdict(list)
+    for asin, day, p in cur:
+        hist[asin].append((day, float(p)))
+    return hist
 
 
 def yesterday_min(conn: sqlite3.Connection, asin: str, today: str) -> float | None:
@@ -372,19 +661,140 @@ def yesterday_min(conn: sqlite3.Connection, asin: str, today: str) -> float | No
     return float(row[0])
 
 
+def archive_old_checks(conn: sqlite3.Connection, retention_days: int) -> int:
+    """Move checks older than retention_days into price_checks_archive.
+
+    Caps the hot table so the daily-min scans and their indexes stay
+    small as history accumulates; the archive keeps every row. 0 disables.
+    """
+    if retention_days <= 0:
+        return 0
+    cutoff = f"-{int(retention_days)} days"
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO price_checks_archive"
+            " SELECT * FROM price_checks WHERE day < date('now', ?, 'localtime')",
+            (cutoff,),
+        )
+        moved = conn.execute(
+            "DELETE FROM price_checks WHERE day < date('now', ?, 'localtime')",
+            (cutoff,),
+        ).rowcount
+    if moved:
+        # No-op unless the DB was created with auto_vacuum=INCREMENTAL,
+        # but cheap to ask for; reclaims the freed pages when it applies.
+        conn.execute("PRAGMA incremental_vacuum")
+    return moved
+
+
 def fmt_money(x: float | None) -> str:
     return "—" if x is None else f"£{x:.2f}"
 
 
+def process_item(item: WatchItem, args) -> dict[str, Any]:
+    """Scrape one ASIN in the calling worker's browser session.
+
+    Pure browser work — no DB access, so it can run on any thread. Errors
+    are folded into the returned record rather than raised.
+    """
+    session = worker_session()
+    try:
+        target_id = worker_tab(session)
+        session.navigate(target_id, f"https://www.amazon.co.uk/dp/{item.asin}")
+        wait_page_ready(session, target_id)
+        rand_sleep(args.min_delay, args.max_delay)
+        data = openclaw_browser_eval_product(session, target_id)
+
+        title = (data.get("title") or "").strip()
+        url = data.get("url")
+
+        buybox_raw = data.get("buyboxPrice")
+        buybox_gbp = parse_price_gbp(buybox_raw)
+
+        lowest_new_raw = None
+        lowest_new_gbp = None
+
+        offers_url = data.get("offersUrl")
+        if offers_url:
+            try:
+                # Force NEW-only if possible
+                if "condition=ALL" in offers_url:
+                    offers_url = offers_url.replace("condition=ALL", "condition=NEW")
+                elif "condition=" not in offers_url:
+                    offers_url += ("&" if "?" in offers_url else "?") + "condition=NEW"
+
+                # Load offers (AOD) in the same tab
+                session.navigate(target_id, offers_url)
+                wait_page_ready(session, target_id)
+                rand_sleep(args.min_delay, args.max_delay)
+
+                # The evaluate scrolls-and-samples inside the page and
+                # returns the lowest NEW offer it saw.
+                od = openclaw_browser_eval_lowest_new_offer(session, target_id)
+                lowest_new_raw = od.get("lowestNewPrice")
+                lowest_new_gbp = parse_price_gbp(lowest_new_raw)
+                if lowest_new_gbp is None:
+                    lowest_new_raw = None
+            except Exception:
+                # best-effort: ignore and fall back to buybox
+                lowest_new_raw = None
+                lowest_new_gbp = None
+
+        # Choose the price we track as primary
+        if lowest_new_gbp is not None:
+            price_raw = lowest_new_raw
+            price_gbp = lowest_new_gbp
+            price_source = "lowest_new_offer"
+        elif buybox_gbp is not None:
+            price_raw = buybox_raw
+            price_gbp = buybox_gbp
+            price_source = "buybox"
+        else:
+            price_raw = None
+            price_gbp = None
+            price_source = "none"
+
+        ok = bool(title)
+        return {
+            "title": title or None,
+            "url": url,
+            "price_raw": price_raw,
+            "price_gbp": price_gbp,
+            "buybox_raw": buybox_raw,
+            "buybox_gbp": buybox_gbp,
+            "lowest_new_raw": lowest_new_raw,
+            "lowest_new_gbp": lowest_new_gbp,
+            "price_source": price_source,
+            "ok": ok,
+            "error": None if ok else "missing-title",
+        }
+    except Exception as e:
+        return {
+            "title": None,
+            "url": f"https://www.amazon.co.uk/dp/{item.asin}",
+            "price_raw": None,
+            "price_gbp": None,
+            "buybox_raw": None,
+            "buybox_gbp": None,
+            "lowest_new_raw": None,
+            "lowest_new_gbp": None,
+            "price_source": "error",
+            "ok": False,
+            "error": str(e)[:300],
+        }
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--watchlist", required=True, help="Path to watchlist JSON")
     ap.add_argument("--db", default=DEFAULT_DB, help=f"SQLite db path (default: {DEFAULT_DB})")
     ap.add_argument("--channel", default=DEFAULT_CHANNEL)
     ap.add_argument("--target", default=DEFAULT_TARGET)
-    ap.add_argument("--min-delay", type=float, default=2.0)
-    ap.add_argument("--max-delay", type=float, default=6.0)
+    ap.add_argument("--min-delay", type=float, default=0.3, help="Anti-bot jitter after each navigation (s)")
+    ap.add_argument("--max-delay", type=float, default=0.9)
+    ap.add_argument("--concurrency", type=int, default=4, help="Parallel browser tabs (1 = old serial behaviour)")
     ap.add_argument("--history-days", type=int, default=5, help="Days of history to include per item")
+    ap.add_argument("--retention-days", type=int, default=90, help="Archive checks older than this (0 = keep forever)")
     ap.add_argument("--dry-run", action="store_true", help="Do not send a message; print it instead")
     args = ap.parse_args()
 
@@ -395,160 +805,75 @@ def main():
     ts = now_ts()
     today = local_day(ts)
 
-    # Ensure browser is up
+    # Products are known up front; upsert them before the scrape starts.
+    conn.executemany(UPSERT_PRODUCT_SQL, [(item.asin, item.label, ts) for item in items])
+    conn.commit()
+
+    # Ensure browser is up, then fan the scrape out across worker threads
+    # (one tab + one session per worker). Completed rows stream to a
+    # background writer thread, so a mid-run crash keeps what finished and
+    # scrapes never wait on an fsync.
     openclaw_browser_start()
 
-    results: list[dict[str, Any]] = []
+    writer_q: queue.Queue = queue.Queue()
+    writer = threading.Thread(target=writer_loop, args=(conn, writer_q), daemon=True)
+    writer.start()
 
+    # Scrape each distinct ASIN once even if the watchlist repeats it
+    # (e.g. two labels for the same product); every watchlist entry still
+    # gets its own row/summary line from the shared scrape.
+    items_by_asin: dict[str, list[WatchItem]] = defaultdict(list)
     for item in items:
-        upsert_product(conn, item.asin, item.label)
-        conn.commit()
+        items_by_asin[item.asin].append(item)
+    unique_items = [group[0] for group in items_by_asin.values()]
 
-        # Visit product page
-        try:
-            target_id = openclaw_browser_open(f"https://www.amazon.co.uk/dp/{item.asin}")
-            rand_sleep(args.min_delay, args.max_delay)
-            data = openclaw_browser_eval_product(target_id)
-            rand_sleep(args.min_delay, args.max_delay)
-
-            title = (data.get("title") or "").strip()
-            url = data.get("url")
-
-            buybox_raw = data.get("buyboxPrice")
-            buybox_gbp = parse_price_gbp(buybox_raw)
-
-            lowest_new_raw = None
-            lowest_new_gbp = None
-
-            offers_url = data.get("offersUrl")
-            if offers_url:
-                try:
-                    # Force NEW-only if possible
-                    if "condition=ALL" in offers_url:
-                        offers_url = offers_url.replace("condition=ALL", "condition=NEW")
-                    elif "condition=" not in offers_url:
-                        offers_url += ("&" if "?" in offers_url else "?") + "condition=NEW"
-
-                    # Load offers (AOD) in the same tab
-                    openclaw_browser_navigate(target_id, offers_url)
-                    rand_sleep(args.min_delay, args.max_delay)
-
-                    # AOD often lazy-loads; sample a few scroll positions and keep the lowest NEW found
-                    best_raw = None
-                    best_gbp = None
-                    for _ in range(4):
-                        od = openclaw_browser_eval_lowest_new_offer(target_id)
-                        cand_raw = od.get("lowestNewPrice")
-                        cand_gbp = parse_price_gbp(cand_raw)
-                        if cand_gbp is not None and (best_gbp is None or cand_gbp < best_gbp):
-                            best_gbp = cand_gbp
-                            best_raw = cand_raw
-
-                        sc = openclaw_browser_scroll_more(target_id)
-                        rand_sleep(args.min_delay, args.max_delay)
-                        if sc.get("atEnd"):
-                            break
-
-                    lowest_new_raw = best_raw
-                    lowest_new_gbp = best_gbp
-                except Exception:
-                    # best-effort: ignore and fall back to buybox
-                    lowest_new_raw = None
-                    lowest_new_gbp = None
-
-            # Choose the price we track as primary
-            if lowest_new_gbp is not None:
-                price_raw = lowest_new_raw
-                price_gbp = lowest_new_gbp
-                price_source = "lowest_new_offer"
-            elif buybox_gbp is not None:
-                price_raw = buybox_raw
-                price_gbp = buybox_gbp
-                price_source = "buybox"
-            else:
-                price_raw = None
-                price_gbp = None
-                price_source = "none"
-
-            ok = bool(title)
-            store_check(
-                conn,
-                run_id=run_id,
-                ts=ts,
-                asin=item.asin,
-                label=item.label,
-                title=title or None,
-                url=url,
-                price_raw=price_raw,
-                price_gbp=price_gbp,
-                buybox_price_raw=buybox_raw,
-                buybox_price_gbp=buybox_gbp,
-                lowest_new_price_raw=lowest_new_raw,
-                lowest_new_price_gbp=lowest_new_gbp,
-                price_source=price_source,
-                ok=ok,
-                error=None if ok else "missing-title",
-            )
-            conn.commit()
-
-            results.append(
-                {
-                    "asin": item.asin,
-                    "label": item.label,
-                    "title": title or item.label,
-                    "price_gbp": price_gbp,
-                    "price_raw": price_raw,
-                    "price_source": price_source,
-                    "url": url or f"https://www.amazon.co.uk/dp/{item.asin}",
-                    "ccc": f"https://uk.camelcamelcamel.com/product/{item.asin}",
-                    "buybox_gbp": buybox_gbp,
-                    "lowest_new_gbp": lowest_new_gbp,
-                }
-            )
-        except Exception as e:
-            store_check(
-                conn,
-                run_id=run_id,
-                ts=ts,
-                asin=item.asin,
-                label=item.label,
-                title=None,
-                url=f"https://www.amazon.co.uk/dp/{item.asin}",
-                price_raw=None,
-                price_gbp=None,
-                buybox_price_raw=None,
-                buybox_price_gbp=None,
-                lowest_new_price_raw=None,
-                lowest_new_price_gbp=None,
-                price_source="error",
-                ok=False,
-                error=str(e)[:300],
-            )
-            conn.commit()
-            results.append(
-                {
-                    "asin": item.asin,
-                    "label": item.label,
-                    "title": item.label,
-                    "price_gbp": None,
-                    "price_raw": None,
-                    "price_source": "error",
-                    "url": f"https://www.amazon.co.uk/dp/{item.asin}",
-                    "ccc": f"https://uk.camelcamelcamel.com/product/{item.asin}",
-                    "error": str(e)[:140],
-                }
-            )
-        finally:
-            try:
-                if 'target_id' in locals() and target_id:
-                    openclaw_browser_close(target_id)
-            except Exception:
-                pass
-
-    # Best deal of this run
+    results: list[dict[str, Any]] = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            for scraped, rec in zip(unique_items, pool.map(lambda it: process_item(it, args), unique_items)):
+                for item in items_by_asin[scraped.asin]:
+                    writer_q.put(check_row(
+                        run_id=run_id,
+                        ts=ts,
+                        day=today,
+                        asin=item.asin,
+                        label=item.label,
+                        title=rec["title"],
+                        url=rec["url"],
+                        price_raw=rec["price_raw"],
+                        price_gbp=rec["price_gbp"],
+                        buybox_price_raw=rec["buybox_raw"],
+                        buybox_price_gbp=rec["buybox_gbp"],
+                        lowest_new_price_raw=rec["lowest_new_raw"],
+                        lowest_new_price_gbp=rec["lowest_new_gbp"],
+                        price_source=rec["price_source"],
+                        ok=rec["ok"],
+                        error=rec["error"],
+                    ))
+
+                    entry = {
+                        "asin": item.asin,
+                        "label": item.label,
+                        "title": rec["title"] or item.label,
+                        "price_gbp": rec["price_gbp"],
+                        "price_raw": rec["price_raw"],
+                        "price_source": rec["price_source"],
+                        "url": rec["url"] or f"https://www.amazon.co.uk/dp/{item.asin}",
+                        "ccc": f"https://uk.camelcamelcamel.com/product/{item.asin}",
+                        "buybox_gbp": rec["buybox_gbp"],
+                        "lowest_new_gbp": rec["lowest_new_gbp"],
+                    }
+                    if rec["price_source"] == "error" and rec["error"]:
+                        entry["error"] = rec["error"][:140]
+                    results.append(entry)
+    finally:
+        shutdown_workers()
+        writer_q.put(None)
+        writer.join()
+
+    # Best deal of this run: O(n) select instead of a full sort
     priced = [r for r in results if r.get("price_gbp") is not None]
-    priced.sort(key=lambda r: r["price_gbp"])
-    best = priced[0] if priced else None
+    best = min(priced, key=lambda r: r["price_gbp"], default=None)
 
     lines: list[str] = []
     lines.append(f"{watch_name} — {today}")
@@ -562,18 +887,19 @@ def main():
 
     lines.append("")
     lines.append("Current prices:")
-    for r in priced[:10]:
+    for r in heapq.nsmallest(10, priced, key=lambda r: r["price_gbp"]):
         lines.append(f"- {r['label']}: {fmt_money(r['price_gbp'])}")
 
     # History per item (daily min)
     lines.append("")
     lines.append(f"History (daily min, last {args.history_days} days):")
+    hist_by_asin = recent_daily_mins(conn, [r["asin"] for r in results], limit_days=args.history_days)
     for r in results:
-        hist = daily_min_prices(conn, r["asin"], limit_days=args.history_days)
+        hist = hist_by_asin.get(r["asin"], [])
         if not hist:
             lines.append(f"- {r['label']}: (no history yet)")
             continue
-        hist_str = ", ".join([f"{day} {fmt_money(p)}" for day, p in reversed(hist)])
+        hist_str = ", ".join(f"{day} {fmt_money(p)}" for day, p in reversed(hist))
         # reversed => oldest->newest for readability
         lines.append(f"- {r['label']}: {hist_str}")
 
@@ -586,6 +912,13 @@ def main():
     else:
         send_message(args.channel, args.target, msg)
 
+    # Housekeeping after the writes: rotate old rows out of the hot table,
+    # then keep planner stats fresh for the history indexes (cheap,
+    # recommended for long-lived DBs).
+    archive_old_checks(conn, args.retention_days)
+    conn.execute("PRAGMA optimize")
+    conn.close()
+
 
 if __name__ == "__main__":
     main()
@@ -19,11 +19,30 @@ import urllib.request
 from dataclasses import dataclass
 from typing import Any
 
+try:
+    # Optional: C JSON codec; parses response/state bytes directly and
+    # serialises the state file without an intermediate str.
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _state_dumps(state: dict[str, Any], *, pretty: bool = False) -> bytes:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _state_dumps(state: dict[str, Any], *, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8")
+        return json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 DEFAULT_CHANNEL = "telegram"
 DEFAULT_TARGET = "476265210"  # Tim
 DEFAULT_THRESHOLD_PCT = 10.0
 DEFAULT_COOLDOWN_HOURS = 12
 DEFAULT_STATE_PATH = "/home/tnu/clawd/data/btc_watch_state.json"
+DEFAULT_CACHE_TTL_S = 60
 
 
 def now_ts() -> int:
@@ -55,8 +74,9 @@ def http_get_json(url: str, *, timeout: int = 20, retries: int = 3) -> Any:
     for i in range(max(1, retries)):
         try:
             with urllib.request.urlopen(req, timeout=timeout) as resp:
-                data = resp.read().decode("utf-8", errors="replace")
-            return json.loads(data)
+                data = resp.read()
+            # Bytes straight into the parser; no intermediate decoded str.
+            return _json_loads(data)
         except Exception as e:
             last_err = e
             # Graceful handling for rate limiting / transient failures
@@ -98,21 +118,50 @@ def fetch_btc() -> BtcSnapshot:
     )
 
 
+def snapshot_from_state(state: dict[str, Any], *, ttl_s: int) -> BtcSnapshot | None:
+    """Rebuild the last fetched snapshot from state if it is still fresh.
+
+    Makes cron-every-minute safe: within the TTL we skip CoinGecko
+    entirely (and its 429s) and reuse what the previous run saw.
+    """
+    last = state.get("lastSnapshot")
+    last_ts = int(state.get("lastSnapshotTs") or 0)
+    if not isinstance(last, dict) or (now_ts() - last_ts) >= max(0, ttl_s):
+        return None
+    return BtcSnapshot(
+        usd=last.get("usd"),
+        gbp=last.get("gbp"),
+        change_24h_pct_usd=last.get("change24hPctUsd"),
+        last_updated_at=last.get("lastUpdatedAt"),
+    )
+
+
 def load_state(path: str) -> dict[str, Any]:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return _json_loads(f.read())
     except FileNotFoundError:
         return {}
     except Exception:
         return {}
 
 
-def save_state(path: str, state: dict[str, Any]):
+def save_state(path: str, state: dict[str, Any], *, pretty: bool = False):
+    # Compact by default: the file is machine-read by the next run, so
+    # indentation only buys size. --pretty restores it for debugging.
     os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = _state_dumps(state, pretty=pretty)
+    try:
+        # Skip the tmp-write + rename when nothing actually changed —
+        # under cron-every-minute most runs only re-derive the same state.
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return
+    except OSError:
+        pass
     tmp = f"{path}.tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+    with open(tmp, "wb") as f:
+        f.write(payload)
     os.replace(tmp, path)
 
 
@@ -135,26 +184,38 @@ def main():
     ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT, help="Alert threshold for abs(24h %% change)")
     ap.add_argument("--cooldown-hours", type=float, default=DEFAULT_COOLDOWN_HOURS, help="Min hours between alerts")
     ap.add_argument("--state", default=DEFAULT_STATE_PATH)
+    ap.add_argument("--cache-ttl", type=int, default=DEFAULT_CACHE_TTL_S, help="Reuse the last fetch for this many seconds")
     ap.add_argument("--channel", default=DEFAULT_CHANNEL)
     ap.add_argument("--target", default=DEFAULT_TARGET)
     ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--pretty", action="store_true", help="Indent the state file (debugging)")
     args = ap.parse_args()
 
-    try:
-        snap = fetch_btc()
-    except Exception as e:
-        # Rate limit or transient network error: skip silently (cron will retry next run)
-        state = load_state(args.state)
-        state["lastFetchError"] = str(e)[:200]
-        state["lastFetchErrorTs"] = now_ts()
-        save_state(args.state, state)
-        return
+    state = load_state(args.state)
+
+    snap = snapshot_from_state(state, ttl_s=args.cache_ttl)
+    if snap is None:
+        try:
+            snap = fetch_btc()
+        except Exception as e:
+            # Rate limit or transient network error: skip silently (cron will retry next run)
+            state["lastFetchError"] = str(e)[:200]
+            state["lastFetchErrorTs"] = now_ts()
+            save_state(args.state, state, pretty=args.pretty)
+            return
+        state["lastSnapshot"] = {
+            "usd": snap.usd,
+            "gbp": snap.gbp,
+            "change24hPctUsd": snap.change_24h_pct_usd,
+            "lastUpdatedAt": snap.last_updated_at,
+        }
+        state["lastSnapshotTs"] = now_ts()
 
     change = snap.change_24h_pct_usd
     if change is None:
+        save_state(args.state, state, pretty=args.pretty)
         return
 
-    state = load_state(args.state)
     last_alert_ts = int(state.get("lastAlertTs") or 0)
     last_alert_sign = state.get("lastAlertSign")  # -1 / +1
 
@@ -163,13 +224,17 @@ def main():
 
     # Only alert when above threshold AND (cooldown ok) AND (sign changed or never alerted)
     if abs(change) < float(args.threshold):
-        # Reset sign memory when move no longer significant
-        state["lastNonSignificantTs"] = now_ts()
-        save_state(args.state, state)
+        # Reset sign memory when move no longer significant. Debounced to
+        # once an hour so a quiet market doesn't dirty the state file (and
+        # force a write) on every cron minute.
+        if now_ts() - int(state.get("lastNonSignificantTs") or 0) >= 3600:
+            state["lastNonSignificantTs"] = now_ts()
+        save_state(args.state, state, pretty=args.pretty)
         return
 
     sign = 1 if change > 0 else -1
     if not eligible and last_alert_sign == sign:
+        save_state(args.state, state, pretty=args.pretty)
         return
 
     msg = (
@@ -189,7 +254,7 @@ def main():
     state["lastAlertChangePct"] = change
     state["lastAlertPriceUsd"] = snap.usd
     state["lastAlertPriceGbp"] = snap.gbp
-    save_state(args.state, state)
+    save_state(args.state, state, pretty=args.pretty)
 
 
 if __name__ == "__main__":
@@ -11,16 +11,33 @@ Cron example (07:00 daily):
 from __future__ import annotations
 
 import argparse
-import datetime as dt
+import functools
+import http.client
+import itertools
 import json
 import subprocess
 import sys
-import urllib.request
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
 from typing import Any
+from urllib.parse import urlsplit
+
+try:
+    # Optional: C JSON parser; parses the response bytes directly.
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 HN_TOP_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{id}.json"
 HN_ITEM_PAGE = "https://news.ycombinator.com/item?id={id}"
+# Algolia returns the whole front page (title/points/comments/url) in one
+# request; the Firebase API needs one request per story.
+HN_ALGOLIA_URL = "https://hn.algolia.com/api/v1/search?tags=front_page&hitsPerPage={n}"
 
 DEFAULT_CHANNEL = "telegram"
 DEFAULT_TARGET = "476265210"  # Tim
@@ -40,11 +57,52 @@ def send_message(channel: str, target: str, message: str) -> None:
     run_cmd(["openclaw", "message", "send", "--channel", channel, "--target", target, "--message", message], timeout=60)
 
 
+# Keep-alive connections, one per host per thread: the item fan-out makes
+# ~150 requests to the same Firebase host, and a fresh TLS handshake per
+# request costs more than the request itself.
+_conn_local = threading.local()
+
+_HEADERS = {"User-Agent": "openclaw-hn-top10/1.0"}
+
+
+def _host_conn(host: str, timeout: int) -> http.client.HTTPSConnection:
+    conns = getattr(_conn_local, "conns", None)
+    if conns is None:
+        conns = _conn_local.conns = {}
+    conn = conns.get(host)
+    if conn is None:
+        conn = conns[host] = http.client.HTTPSConnection(host, timeout=timeout)
+    return conn
+
+
+@functools.lru_cache(maxsize=256)
 def http_json(url: str, *, timeout: int = 20) -> Any:
-    req = urllib.request.Request(url, headers={"User-Agent": "openclaw-hn-top10/1.0"})
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        data = r.read().decode("utf-8", errors="replace")
-    return json.loads(data)
+    # Memoised per process: makes re-fetching the same URL (e.g. the
+    # Algolia→Firebase fallback path, or future retry logic) free.
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    conn = _host_conn(parts.netloc, timeout)
+    try:
+        conn.request("GET", path, headers=_HEADERS)
+        resp = conn.getresponse()
+        data = resp.read()
+    except (http.client.HTTPException, OSError):
+        # Stale keep-alive socket: reconnect once and retry.
+        conn.close()
+        conn.request("GET", path, headers=_HEADERS)
+        resp = conn.getresponse()
+        data = resp.read()
+    if resp.status != 200:
+        raise RuntimeError(f"HTTP {resp.status} for {url}")
+    # Bytes straight into the parser; no intermediate decoded str.
+    return _json_loads(data)
+
+
+def _safe_http_json(url: str) -> Any:
+    try:
+        return http_json(url)
+    except Exception:
+        return None
 
 
 def fmt_item(n: int, item: dict[str, Any]) -> str:
@@ -69,6 +127,68 @@ def fmt_item(n: int, item: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+def fetch_top_items_algolia(want: int) -> list[dict[str, Any]]:
+    """Front page in one round trip, mapped onto the Firebase item shape."""
+    data = http_json(HN_ALGOLIA_URL.format(n=want))
+    hits = data.get("hits") if isinstance(data, dict) else None
+    if not hits:
+        raise RuntimeError("No Algolia hits")
+    items: list[dict[str, Any]] = []
+    for h in hits[:want]:
+        oid = h.get("objectID")
+        items.append(
+            {
+                "id": int(oid) if oid else None,
+                "title": h.get("title"),
+                "score": h.get("points"),
+                "descendants": h.get("num_comments"),
+                "url": h.get("url"),
+            }
+        )
+    return items
+
+
+def fetch_top_items_firebase(want: int, *, timeout: float) -> list[dict[str, Any]]:
+    top_ids = http_json(HN_TOP_URL)
+    if not isinstance(top_ids, list):
+        raise RuntimeError("Unexpected topstories payload")
+
+    # Fetch in sliding-window batches: the shortfall plus a small
+    # overshoot for deleted/dead items, in parallel and in top-stories
+    # order, rather than pre-fetching the whole 3x candidate slice.
+    candidate_ids = [int(i) for i in top_ids[: max(50, want * 3)]]
+    ids_iter = iter(candidate_ids)
+    deadline = time.monotonic() + timeout
+
+    items: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        while len(items) < want and time.monotonic() < deadline:
+            batch = list(itertools.islice(ids_iter, want - len(items) + 3))
+            if not batch:
+                break
+            try:
+                fetched = list(
+                    pool.map(
+                        _safe_http_json,
+                        (HN_ITEM_URL.format(id=i) for i in batch),
+                        timeout=max(0.1, deadline - time.monotonic()),
+                    )
+                )
+            except FutureTimeoutError:
+                break
+            for obj in fetched:
+                if not isinstance(obj, dict):
+                    continue
+                if obj.get("deleted") or obj.get("dead"):
+                    continue
+                if obj.get("type") not in ("story", None):
+                    continue
+                items.append(obj)
+                if len(items) >= want:
+                    break
+    return items
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--channel", default=DEFAULT_CHANNEL)
@@ -77,34 +197,15 @@ def main() -> int:
     ap.add_argument("--timeout", type=int, default=120, help="Overall timeout seconds")
     args = ap.parse_args()
 
-    t0 = dt.datetime.now(dt.timezone.utc)
-
-    top_ids = http_json(HN_TOP_URL)
-    if not isinstance(top_ids, list):
-        raise RuntimeError("Unexpected topstories payload")
-
-    items: list[dict[str, Any]] = []
-    # Fetch a few extra to compensate for deleted/invalid items
     want = max(1, int(args.count))
-    for item_id in top_ids[: max(50, want * 3)]:
-        if (dt.datetime.now(dt.timezone.utc) - t0).total_seconds() > float(args.timeout):
-            break
-        try:
-            obj = http_json(HN_ITEM_URL.format(id=int(item_id)))
-        except Exception:
-            continue
-        if not isinstance(obj, dict):
-            continue
-        if obj.get("deleted") or obj.get("dead"):
-            continue
-        if obj.get("type") not in ("story", None):
-            continue
-        items.append(obj)
-        if len(items) >= want:
-            break
+    try:
+        items = fetch_top_items_algolia(want)
+    except Exception:
+        # Algolia down or reshaped: fall back to the per-item Firebase API.
+        items = fetch_top_items_firebase(want, timeout=float(args.timeout))
 
     # If we didn't get enough, still send what we have.
-    local_date = dt.datetime.now().strftime("%Y-%m-%d")
+    local_date = datetime.now().strftime("%Y-%m-%d")
     lines = [f"HN Top {min(want, len(items))} — {local_date}", ""]
     for i, it in enumerate(items[:want], start=1):
         lines.append(fmt_item(i, it))
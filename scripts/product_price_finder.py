@@ -12,6 +12,7 @@ accidentally run stale logic.
 
 from __future__ import annotations
 
+import importlib.util
 import os
 import sys
 
@@ -26,7 +27,24 @@ def main() -> None:
         print(f"ERROR: expected up-to-date product finder at: {real}", file=sys.stderr)
         sys.exit(2)
 
-    os.execv(sys.executable, [sys.executable, real, *sys.argv[1:]])
+    forwarded = sys.argv[1:]
+    try:
+        # Import and run in-process: skips the full interpreter re-exec
+        # (site + stdlib re-import) that os.execv paid on every call.
+        spec = importlib.util.spec_from_file_location("product_price_finder_real", real)
+        mod = importlib.util.module_from_spec(spec)
+        sys.argv = [real, *forwarded]
+        spec.loader.exec_module(mod)
+    except SystemExit:
+        raise
+    except Exception:
+        # Import-time trouble: fall back to the old re-exec so behaviour
+        # degrades rather than breaks.
+        os.execv(sys.executable, [sys.executable, real, *forwarded])
+        return
+
+    if hasattr(mod, "main"):
+        mod.main()
 
 
 if __name__ == "__main__":